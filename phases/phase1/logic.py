@@ -1,13 +1,35 @@
 # phases/phase1/main.py
 
+from functools import lru_cache
+
 from ..base_phase import BasePhase
 
 
 class Node:
+    __slots__ = ('value', 'left', 'right', '_hash')
+
     def __init__(self, val):
         self.value = val
         self.left = None
         self.right = None
+        self._hash = None
+
+    def __hash__(self):
+        # Computed once on first use, so a tree must not be rewritten after
+        # it has been hashed or compared (Phase 2 only rewrites fresh trees).
+        h = self._hash
+        if h is None:
+            h = self._hash = hash((self.value, self.left, self.right))
+        return h
+
+    def __eq__(self, other):
+        """Structural equality; a hash mismatch rules it out without a walk."""
+        if self is other:
+            return True
+        if type(other) is not Node:
+            return NotImplemented
+        return (hash(self) == hash(other) and self.value == other.value and
+                self.left == other.left and self.right == other.right)
 
 
 class Phase1(BasePhase):
@@ -187,3 +209,18 @@ class Phase1(BasePhase):
         cleaned_lines = [line.strip("\\") for line in output.splitlines()]
         sanitized = "\n".join(cleaned_lines).strip()
         return sanitized
+
+
+_phase1 = Phase1()
+
+
+@lru_cache(maxsize=4096)
+def parse_formula(formula_str: str) -> Node:
+    """
+    Parse a single formula into a tree, cached on the formula text.
+
+    The same tree is handed out on every hit (Phases 4 and 5 share this cache).
+    That is safe because no Phase 4 or Phase 5 rule mutates its input nodes;
+    rules only build new nodes on top of them.
+    """
+    return _phase1.parse_tree(formula_str)
@@ -1,7 +1,24 @@
 # phases/phase3/main.py
 
+import re
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Deque, List, Set, Tuple
+
 from ..base_phase import BasePhase
 
+# A Horn clause as (antecedent ids, consequent id), e.g. ((1, 2), 3) for A ∧ B → C.
+# Atoms are interned to small ints at parse time; the antecedents are distinct.
+HornClause = Tuple[Tuple[int, ...], int]
+
+# '⊥' always gets atom id 0
+_BOTTOM = 0
+
+# Connectives that can never appear in a Horn formula
+_NON_HORN_RE = re.compile(r"[¬∨⇒⇔]")
+
+
 class Phase3(BasePhase):
     """
     Implements Phase 3: Horn Satisfiability Solver.
@@ -22,79 +39,10 @@ class Phase3(BasePhase):
         """
         print("Initiating Horn SAT Protocol...")
 
-        # --- TEAMMATE: Your actual Phase 3 logic goes here ---
         try:
-            is_satisfiable, assignment_or_message = True, "[list of true variables]"
-
-            input_data = input_data.replace(' ','')
-            current = ''
-            open_parens = 0
-            n = len(input_data)
-            clauses_list = []
-            clauses = []
-            variables = set()
-            i = 0
-            while i < n:
-                c = input_data[i]
-                current += c
-
-                if c == '(':
-                    open_parens += 1
-                elif c == ')':
-                    open_parens -= 1
-                
-                if open_parens == 0 and ((i+1 < n and input_data[i+1] == '∧') or i+1 == n):
-                    clauses_list.append(current.strip('()'))
-                    current = ''
-                    i += 1
-                i += 1
-
-            for clause in clauses_list:
-                if '∧' not in clause and '→' not in clause:
-                    raise ValueError
-                
-                parts = clause.split('→')
+            atom_names, clauses = self._parse(input_data)
+            is_satisfiable, assignment_or_message = self._solve(atom_names, clauses)
 
-                if len(parts) != 2:
-                    raise ValueError
-                
-                consequent = parts[1]
-                antecedents = parts[0].split('∧')
-                antecedents = [a for a in antecedents if a != '⊤']
-                
-
-                for a in antecedents:
-                    if a != '⊥' and not a.isalpha():
-                        raise ValueError
-                    
-                    if a not in ['⊤', '⊥']:
-                        variables.add(a)
-                
-                if consequent != '⊥' and consequent != '⊤' and not consequent.isalpha():
-                    raise ValueError
-                if consequent not in ['⊤', '⊥']:
-                    variables.add(consequent)
-                
-                clauses.append((antecedents, consequent))
-
-            #forward chaining algorithm
-            true_vars = set()
-            changed = True
-
-            while changed:
-                changed = False
-                for antecedents, consequent in clauses:
-                    if consequent in true_vars:
-                        continue
-                    if all(a in true_vars or a == '⊤' for a in antecedents):
-                        if consequent == '⊥':
-                            is_satisfiable = False
-                        if consequent not in true_vars:
-                            true_vars.add(consequent)
-                            changed = True
-
-            assignment_or_message = true_vars
-            
             if is_satisfiable:
                 if assignment_or_message:
                     # If satisfiable and there's an assignment, print it nicely.
@@ -109,3 +57,113 @@ class Phase3(BasePhase):
             return f"Invalid Horn Formula"
         except Exception as e:
             return f"An unexpected error occurred during Horn solving: {e}"
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse(input_data: str) -> Tuple[Tuple[str, ...], Tuple[HornClause, ...]]:
+        """
+        Splits a Horn formula into its clauses, interning every atom to an int id.
+
+        The result is cached on the raw formula text, so it is returned as an
+        immutable tuple and must not be modified by the caller.
+
+        Returns:
+            Tuple: The atom names indexed by id, and the clauses over those ids.
+
+        Raises:
+            ValueError: If the formula is not a valid Horn formula.
+        """
+        if _NON_HORN_RE.search(input_data):
+            raise ValueError
+        input_data = input_data.replace(' ', '')
+
+        # Split on every '∧', then glue back the pieces that were cut inside
+        # parentheses: a clause ends where the parens seen so far balance out.
+        pieces = input_data.split('∧')
+        if not pieces[-1]:
+            pieces.pop()  # a trailing '∧' (or empty input) adds no clause
+        clauses_list = []
+        clauses = []
+        atom_ids = {'⊥': _BOTTOM}
+        current = []
+        open_parens = 0
+        for piece in pieces:
+            current.append(piece)
+            open_parens += piece.count('(') - piece.count(')')
+            if open_parens == 0:
+                clauses_list.append('∧'.join(current).strip('()'))
+                current = []
+
+        for clause in clauses_list:
+            if '∧' not in clause and '→' not in clause:
+                raise ValueError
+
+            parts = clause.split('→')
+
+            if len(parts) != 2:
+                raise ValueError
+
+            consequent = parts[1]
+            antecedents = parts[0].split('∧')
+            antecedents = [a for a in antecedents if a != '⊤']
+
+            for a in antecedents:
+                if a != '⊥' and not a.isalpha():
+                    raise ValueError
+
+            if consequent != '⊥' and consequent != '⊤' and not consequent.isalpha():
+                raise ValueError
+
+            body = tuple({atom_ids.setdefault(a, len(atom_ids)): None for a in antecedents})
+            clauses.append((body, atom_ids.setdefault(consequent, len(atom_ids))))
+
+        return tuple(atom_ids), tuple(clauses)
+
+    @staticmethod
+    def _solve(atom_names: Tuple[str, ...], clauses: Tuple[HornClause, ...]) -> Tuple[bool, Set[str]]:
+        """
+        Runs linear-time unit propagation over the clauses.
+
+        Each clause keeps a count of antecedents not yet known to be true, and
+        each atom watches the clauses it appears in. Deriving an atom only
+        touches its watchers, so every clause is visited once per antecedent.
+
+        Single-antecedent clauses (A → B), which make up the long implication
+        chains, skip the counters entirely: they go into a plain implication
+        map and fire as soon as their antecedent is derived.
+
+        Propagation stops as soon as ⊥ is derived.
+
+        Returns:
+            Tuple[bool, Set[str]]: Whether the formula is satisfiable, and the atoms forced true.
+        """
+        assigned = bytearray(len(atom_names))
+        pending = array('i', [len(body) for body, _ in clauses])
+        watchers: List[List[int]] = [[] for _ in atom_names]
+        implies: List[List[int]] = [[] for _ in atom_names]
+        queue: Deque[int] = deque()
+
+        for idx, (body, head) in enumerate(clauses):
+            if not body:
+                queue.append(head)
+            elif len(body) == 1:
+                implies[body[0]].append(head)
+            else:
+                for a in body:
+                    watchers[a].append(idx)
+
+        while queue:
+            atom = queue.popleft()
+            if atom == _BOTTOM:
+                return False, set()  # nothing derived after a contradiction matters
+            if assigned[atom]:
+                continue
+            assigned[atom] = 1
+            queue.extend(implies[atom])
+            for idx in watchers[atom]:
+                pending[idx] -= 1
+                if pending[idx] == 0:
+                    queue.append(clauses[idx][1])
+
+        true_vars = {name for name, is_true in zip(atom_names, assigned) if is_true}
+        return True, true_vars
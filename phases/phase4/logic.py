@@ -1,10 +1,11 @@
+import re
 from typing import List, Optional, Dict, Type
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 
 from phases.base_phase import BasePhase
-from phases.phase1.logic import Node, Phase1
+from phases.phase1.logic import Node, parse_formula
 from phases.phase2.logic import Phase2
 
 
@@ -15,7 +16,7 @@ class LogicSymbol(Enum):
     CONTRADICTION = "⊥"
     OR = "∨"
 
-@dataclass
+@dataclass(slots=True)
 class LogicLine:
     line_number: int
     formula: Optional[Node] = None
@@ -47,24 +48,7 @@ class LogicRule(ABC):
 
     def _nodes_equal(self, node1: Node, node2: Node) -> bool:
         """Check if two nodes are structurally equal"""
-        if node1.value != node2.value:
-            return False
-
-        if node1.left is None and node2.left is None:
-            left_equal = True
-        elif node1.left is not None and node2.left is not None:
-            left_equal = self._nodes_equal(node1.left, node2.left)
-        else:
-            left_equal = False
-
-        if node1.right is None and node2.right is None:
-            right_equal = True
-        elif node1.right is not None and node2.right is not None:
-            right_equal = self._nodes_equal(node1.right, node2.right)
-        else:
-            right_equal = False
-
-        return left_equal and right_equal
+        return node1 == node2
 
 
 class AndIntro(LogicRule):
@@ -245,46 +229,56 @@ class DoubleNegIntro(LogicRule):
         return outer_negation
 
 
+# "<line number>    <formula>" (4 spaces) and "<rule>[,<line>,...]";
+# a further run of 4 spaces anywhere in the formula is an extra field
+_PREMISE_LINE_RE = re.compile(r"^\s*(\d+) {4}((?:(?! {4}).)+)$")
+_RULE_LINE_RE = re.compile(r"^\s*([^,]+?)\s*(?:,(.*))?$")
+
+
 class InputParser:
     """Handles parsing of input data"""
 
-    def __init__(self):
-        self.phase1 = Phase1()
-
-    def parse_input(self, input_data: str) -> tuple[List[LogicLine], str, List[int]]:
-        """Parse input data into logic lines, rule name, and line numbers"""
-        lines = input_data.strip().split('\n')
+    def parse_input(self, input_data: str) -> tuple[Dict[int, LogicLine], str, List[int]]:
+        """Parse input data into logic lines keyed by line number, rule name, and line numbers"""
+        # Single pass: premises start with their line number, and the first
+        # line that doesn't is the rule line, which must be the last one.
+        logic_lines: Dict[int, LogicLine] = {}
+        rule_line = None
+        for line in input_data.split('\n'):
+            stripped = line.strip()
+            if not stripped:
+                continue
 
-        if not lines:
-            raise ValueError("Empty input")
+            if rule_line is not None:
+                raise ValueError(f"Unexpected line after rule specification: {line}")
 
-        # Parse logic lines (all but the last line)
-        logic_lines = []
-        for line in lines[:-1]:
-            if not line.strip():
+            if not stripped[0].isdigit():
+                rule_line = stripped
                 continue
 
-            parts = line.split('    ')  # 4 spaces
-            if len(parts) != 2:
+            match = _PREMISE_LINE_RE.match(line)
+            if match is None:
                 raise ValueError(f"Invalid line format: {line}")
 
             try:
-                line_number = int(parts[0])
-                formula_str = parts[1]
-                formula_node = self.phase1.parse_tree(formula_str)
-                logic_lines.append(LogicLine(line_number, formula_node))
+                line_number = int(match.group(1))
+                formula_str = match.group(2)
+                formula_node = parse_formula(formula_str)
+                logic_lines[line_number] = LogicLine(line_number, formula_node)
             except ValueError as e:
                 raise ValueError(f"Error parsing line {line}: {e}")
 
-        # Parse rule line (last line)
-        rule_parts = lines[-1].split(',')
-        if not rule_parts:
+        if rule_line is None:
+            raise ValueError("Missing rule specification")
+
+        match = _RULE_LINE_RE.match(rule_line)
+        if match is None:
             raise ValueError("Missing rule specification")
 
-        rule_name = rule_parts[0].strip()
+        rule_name, refs = match.groups()
 
         try:
-            line_numbers = [int(num.strip()) for num in rule_parts[1:]]
+            line_numbers = [int(num) for num in refs.split(',')] if refs is not None else []
         except ValueError:
             raise ValueError("Invalid line numbers in rule specification")
 
@@ -301,18 +295,20 @@ class Phase4(BasePhase):
 
     RULE_CANNOT_BE_APPLIED = "Rule Cannot Be Applied"
 
+    # Rule name -> rule class; shared by every instance, so built once here
+    logic_rule_map: Dict[str, Type[LogicRule]] = {
+        "∧i": AndIntro,
+        "∧e1": AndElimLeft,
+        "∧e2": AndElimRight,
+        "→e": ImpElim,
+        "¬e": NegElim,
+        "¬¬e": DoubleNegElim,
+        "MT": ModusTollens,
+        "¬¬i": DoubleNegIntro,
+    }
+
     def __init__(self, input_filepath: Optional[str] = None):
         super().__init__(input_filepath)
-        self.logic_rule_map: Dict[str, Type[LogicRule]] = {
-            "∧i": AndIntro,
-            "∧e1": AndElimLeft,
-            "∧e2": AndElimRight,
-            "→e": ImpElim,
-            "¬e": NegElim,
-            "¬¬e": DoubleNegElim,
-            "MT": ModusTollens,
-            "¬¬i": DoubleNegIntro,
-        }
         self.parser = InputParser()
         self.phase2 = Phase2()
 
@@ -348,15 +344,14 @@ class Phase4(BasePhase):
             return self.RULE_CANNOT_BE_APPLIED
 
     @staticmethod
-    def _get_formulas_for_lines(logic_lines: List[LogicLine], line_numbers: List[int]) -> List[Node]:
+    def _get_formulas_for_lines(logic_lines: Dict[int, LogicLine], line_numbers: List[int]) -> List[Node]:
         """Extract formulas for the specifed line numbers"""
-        line_map = {line.line_number: line.formula for line in logic_lines}
-
         formulas = []
         for line_num in line_numbers:
-            if line_num not in line_map:
+            try:
+                formula = logic_lines[line_num].formula
+            except KeyError:
                 raise ValueError(f"Line number {line_num} not found")
-            formula = line_map[line_num]
             if formula is None:
                 raise ValueError(f"No formula found for line {line_num}")
             formulas.append(formula)
@@ -1,26 +1,45 @@
-from typing import List, Optional, Dict, Type, Union, Tuple
+import re
+from typing import Callable, List, Optional, Dict, Sequence, Type, Union, Tuple
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 from phases.base_phase import BasePhase
-from phases.phase1.logic import Node, Phase1
-from phases.phase4.logic import LogicRuleError, LogicSymbol, AndIntro, AndElimRight, AndElimLeft, ImpElim, NegElim, \
+from phases.phase1.logic import Node, parse_formula
+from phases.phase4.logic import LogicRule as Phase4LogicRule, LogicRuleError, LogicSymbol, AndIntro, AndElimRight, AndElimLeft, ImpElim, NegElim, \
     DoubleNegElim, ModusTollens, DoubleNegIntro, Phase4
 
 
-@dataclass
+@dataclass(slots=True)
 class LogicLine:
     line_number: Optional[int]  # none for beginscope/endscope
     formula: Optional[Node]
-    rule_name: Optional[str]
+    rule_name: str
     refs: List[Union[int, Tuple[int, int]]]
     indent: int
+    # filled in by Phase5._resolve_refs once the whole proof is parsed
+    int_refs: List[int] = field(default_factory=list)
+    range_refs: List[Tuple[int, int]] = field(default_factory=list)
+    int_nodes: List[Node] = field(default_factory=list)  # formulas of the int_refs that exist
+    # Valid-line masks index lines by their position in the proof, not by
+    # line number, so they stay as small as the proof itself
+    bit: int = 0  # this line's bit; 0 for scope lines
+    int_mask: int = 0  # the bits of the lines in int_refs
+    range_masks: List[int] = field(default_factory=list)  # the bits of every line in each range
+    range_lines: List[Tuple[Optional['LogicLine'], Optional['LogicLine']]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ParsedProof:
+    """A proof as returned by Phase5.parse(): its lines with references resolved."""
+    lines: Tuple[LogicLine, ...]
+    premise_mask: int  # the bits of every Premise line, valid from the start
 
 
 class LogicRule(ABC):
     """Abstract base class for all logic rules"""
 
-    def __init__(self, nodes: List[Node], rule_name: str = None):
+    def __init__(self, nodes: List[Node], rule_name: Optional[str] = None):
         self.rule_name = rule_name
         self.nodes = nodes
         self._validate_input()
@@ -35,31 +54,44 @@ class LogicRule(ABC):
         """Apply the logic rule and return the result"""
         pass
 
-    def _nodes_equal(self, node1: Node, node2: Node) -> bool:
+    def _nodes_equal(self, node1: Optional[Node], node2: Optional[Node]) -> bool:
         """Check if two nodes are structurally equal,
            accounting for commutativity of ∨ and ∧."""
-        if node1.value != node2.value:
-            return False
+        return node1 == node2 or commutative_key(node1) == commutative_key(node2)
+
+
+_COMMUTATIVE = frozenset({"∨", "∧"})
+
 
-        def eq(n1, n2):
-            if n1 is None and n2 is None:
-                return True
-            if n1 is None or n2 is None:
-                return False
-            return self._nodes_equal(n1, n2)
+def commutative_key(node: Optional[Node]) -> tuple:
+    """Return a key shared by trees that are equal up to swapping the
+    operands of ∧ and ∨ (at any depth); used for LogicRule._nodes_equal."""
+    if node is None:
+        return ()
+    left, right = commutative_key(node.left), commutative_key(node.right)
+    if node.value in _COMMUTATIVE and right < left:
+        left, right = right, left
+    return (node.value, left, right)
 
-        if node1.value in {"∨", "∧"}:
-            direct = eq(node1.left, node2.left) and eq(node1.right, node2.right)
-            swapped = eq(node1.left, node2.right) and eq(node1.right, node2.left)
-            return direct or swapped
 
-        return eq(node1.left, node2.left) and eq(node1.right, node2.right)
+def _range_mask(bits: Dict[int, int], missing: int, start: int, end: int) -> int:
+    """Return the bits of every line numbered in [start, end], plus the missing
+    bit when some number in that range has no line."""
+    mask = 0
+    count = 0
+    for num, bit in bits.items():
+        if start <= num <= end:
+            mask |= bit
+            count += 1
+    if count < end - start + 1:
+        mask |= missing
+    return mask
 
 
 class OrIntroLeft(LogicRule):
     """∨i1: From A, infer A ∨ B."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 2:
             raise LogicRuleError("OrIntroLeft needs exactly two nodes (premise and target disjunction)")
 
@@ -79,7 +111,7 @@ class OrIntroLeft(LogicRule):
 class OrIntroRight(LogicRule):
     """∨i2: From B, infer A ∨ B."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 2:
             raise LogicRuleError("OrIntroRight needs exactly two nodes (premise and target disjunction)")
 
@@ -98,7 +130,7 @@ class OrIntroRight(LogicRule):
 class OrElim(LogicRule):
     """∨e: from A ∨ B, A ⊢ C and B ⊢ c derive C."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 3:
             raise LogicRuleError("OrElim needs exactly three nodes!")
 
@@ -116,7 +148,7 @@ class OrElim(LogicRule):
 class ImpIntro(LogicRule):
     """→i: if we can derive B from (A) we can conclude A → B."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 2:
             raise LogicRuleError("ImpIntro needs exactly two nodes!")
 
@@ -131,7 +163,7 @@ class ImpIntro(LogicRule):
 class FalseElim(LogicRule):
     """⊥e: From contradiction, derive any proposition."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 2:
             raise LogicRuleError("FalseElim needs exactly two nodes!")
 
@@ -145,7 +177,7 @@ class FalseElim(LogicRule):
 class PBC(LogicRule):
     """PBC: If assuming ¬A leads to ⊥ then infer A. """
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 2:
             raise LogicRuleError("PBC needs exactly two nodes!")
 
@@ -163,7 +195,7 @@ class PBC(LogicRule):
 class NegIntro(LogicRule):
     """¬i: If assuming A leads to ⊥ then infer ¬A."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 2:
             raise LogicRuleError("NegIntro needs exactly two nodes!")
 
@@ -181,7 +213,7 @@ class NegIntro(LogicRule):
 class LEM(LogicRule):
     """LEM: Infer A ∨ ¬A without premises."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 1:
             raise LogicRuleError("LEM needs only one node!")
 
@@ -200,7 +232,7 @@ class LEM(LogicRule):
 class CopyRule(LogicRule):
     """Copy: repeat a formula from another line."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 1:
             raise ValueError("Copy rule requires exactly one input!")
 
@@ -211,7 +243,7 @@ class CopyRule(LogicRule):
 class Assumption(LogicRule):
     """Assumption: A formula assumed within a scope."""
 
-    def _validate_input(self):
+    def _validate_input(self) -> None:
         if len(self.nodes) != 0:
             raise LogicRuleError("Assumption doesn't need input nodes")
 
@@ -219,10 +251,14 @@ class Assumption(LogicRule):
         raise LogicRuleError("Assumption cannot be applied directly")
 
 
-class NaturalDeductionParser:
-    def __init__(self):
-        self.phase1 = Phase1()
+# "<num>    <formula>    <rule>[, refs]": fields are separated by 4 spaces, with
+# any other whitespace around a separator ignored, and anything after a further
+# separator is ignored too
+_SEP = r'[^\S\n]* {4}[^\S\n]*'
+_LINE_RE = re.compile(rf'^(?P<num>\d+){_SEP}(?P<formula>\S.*?){_SEP}(?P<rule>\S.*?)(?:{_SEP}.*)?$')
+
 
+class NaturalDeductionParser:
     def parse(self, input_data: str) -> List[LogicLine]:
         result = []
         lines = input_data.strip().split('\n')
@@ -238,33 +274,36 @@ class NaturalDeductionParser:
 
             line = line.strip()
 
-            if line in ['BeginScope', 'EndScope']:
+            # Numbered lines are the common case; anything else must be a scope marker
+            if not line[0].isdigit():
+                if line != 'BeginScope' and line != 'EndScope':
+                    raise ValueError(f"Invalid line format: '{line}'")
                 result.append(LogicLine(None, None, line, [], indent))
                 continue
 
-            parts = [p.strip() for p in line.split('    ') if p.strip()]
-            if len(parts) < 3:
+            match = _LINE_RE.match(line)
+            if match is None:
                 raise ValueError(f"Invalid line format: '{line}'")
 
             try:
-                line_number = int(parts[0])
-                formula_str = parts[1]
-                rule_part = parts[2]
-
-                node = self.phase1.parse_tree(formula_str)
-
-                if ',' in rule_part:
-                    rule_name, *refs = [x.strip() for x in rule_part.split(',')]
-                    processed_refs = []
-                    for ref in refs:
-                        if '-' in ref:
-                            start, end = map(int, ref.split('-'))
-                            processed_refs.append((start, end))
+                line_number = int(match['num'])
+                formula_str = match['formula']
+                rule_part = match['rule']
+
+                node = parse_formula(formula_str)
+
+                head, sep, tail = rule_part.partition(',')
+                rule_name = head.strip()
+                processed_refs = []
+                if sep:
+                    for ref in tail.split(','):
+                        start, dash, end = ref.partition('-')
+                        if not dash:
+                            processed_refs.append(int(start))
+                        elif start.strip().isdigit() and end.strip().isdigit():
+                            processed_refs.append((int(start), int(end)))
                         else:
-                            processed_refs.append(int(ref))
-                else:
-                    rule_name = rule_part
-                    processed_refs = []
+                            raise ValueError(f"Invalid range reference: '{ref.strip()}'")
 
                 result.append(LogicLine(line_number, node, rule_name, processed_refs, indent))
 
@@ -274,29 +313,11 @@ class NaturalDeductionParser:
         return result
 
 
-def rule_name_to_class(name: str) -> Optional[Type[LogicRule]]:
-    return {
-        "Premise": None,
-        "Assumption": Assumption,
-        "∧i": AndIntro,
-        "∧e1": AndElimLeft,
-        "∧e2": AndElimRight,
-        "→e": ImpElim,
-        "¬e": NegElim,
-        "¬¬e": DoubleNegElim,
-        "MT": ModusTollens,
-        "¬¬i": DoubleNegIntro,
-        "¬i": NegIntro,
-        "Copy": CopyRule,
-        "∨i1": OrIntroLeft,
-        "∨i2": OrIntroRight,
-        "∨e": OrElim,
-        "→i": ImpIntro,
-        "⊥e": FalseElim,
-        "PBC": PBC,
-        "LEM": LEM
-    }.get(name)
-
+# Rule names map to Phase 5's own rules and to the Phase 4 rules it reuses
+AnyRule = Union[LogicRule, Phase4LogicRule]
+RuleClass = Union[Type[LogicRule], Type[Phase4LogicRule]]
+# Checks the references of a line; see the rule checks in Phase5
+RuleCheck = Callable[..., Optional[AnyRule]]
 
 class Phase5(BasePhase):
     """
@@ -330,371 +351,310 @@ class Phase5(BasePhase):
         input_data: all the proof text
         return: "Valid Deduction" or "Invalid Deduction at Line X"
         """
-        parser = NaturalDeductionParser()
+        # parse() is cached on the text, so a repeated proof is only validated again
         try:
-            lines = parser.parse(input_data)
+            proof = self.parse(input_data)
         except Exception as e:
             return f"Invalid input format: {e}"
 
-        line_map = {line.line_number: line for line in lines if line.line_number is not None}
-        valid_lines = set()
-        scope_stack = [set()]
-        scope_assumptions = {}
+        return self.validate(proof)
 
-        for num, line in line_map.items():
-            if line.rule_name == "Premise":
-                valid_lines.add(num)
-                scope_stack[0].add(num)
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def parse(input_data: str) -> ParsedProof:
+        """
+        Parse the proof text into lines with their references already resolved.
+
+        Cached on the raw text. validate() only reads the result, so the same
+        proof can be checked any number of times.
+        """
+        return Phase5._resolve_refs(NaturalDeductionParser().parse(input_data))
+
+    def validate(self, proof: Union[ParsedProof, Sequence[LogicLine]]) -> str:
+        """
+        Check every line and rule of a parsed proof.
+
+        proof: the output of parse(); plain lines (NaturalDeductionParser output)
+               have their references resolved first
+        return: "Valid Deduction" or "Invalid Deduction at Line X"
+        """
+        if not isinstance(proof, ParsedProof):
+            proof = self._resolve_refs(list(proof))
 
+        valid_mask = proof.premise_mask  # a line's bit is set once it is valid
+        # Lines stay usable once derived, so scopes only need their nesting
+        # depth tracked to catch an EndScope without a matching BeginScope
         current_scope_level = 0
 
-        for line in lines:
-            if line.line_number is None:
-                if line.rule_name == "BeginScope":
+        for line in proof.lines:
+            rule_name = line.rule_name
+            line_number = line.line_number
+            formula = line.formula
+
+            # Only BeginScope/EndScope lines come without a number and formula
+            if line_number is None or formula is None:
+                if rule_name == "BeginScope":
                     current_scope_level += 1
-                    scope_stack.append(set())
-                elif line.rule_name == "EndScope":
-                    if len(scope_stack) <= 1:
+                elif rule_name == "EndScope":
+                    if current_scope_level == 0:
                         return "Invalid Deduction: unmatched EndScope"
-                    ended_scope = scope_stack.pop()
                     current_scope_level -= 1
                 continue
 
-            if line.rule_name in ["Premise", "Assumption"]:
-                if line.rule_name == "Assumption":
-                    scope_stack[-1].add(line.line_number)
-                    valid_lines.add(line.line_number)
-                    scope_assumptions[current_scope_level] = line.line_number
+            if rule_name in ["Premise", "Assumption"]:
+                if rule_name == "Assumption":
+                    valid_mask |= line.bit
                 continue
 
-            rule_class = rule_name_to_class(line.rule_name)
-            if not rule_class:
-                return f"Invalid Deduction at Line {line.line_number}"
+            entry = self._RULES.get(rule_name)
+            if entry is None:
+                return f"Invalid Deduction at Line {line_number}"
+            rule_class, check = entry
 
             try:
-                if line.rule_name in ["Premise", "Assumption"]:
-                    continue
-                elif line.rule_name == "LEM":
-                    if len(line.refs) != 0:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    expected_formula = line.formula
-                    if expected_formula.value != LogicSymbol.OR.value:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    # check if it's A ∨ ¬A format
-                    if (expected_formula.right is not None and
-                            expected_formula.right.value == LogicSymbol.NOT.value and
-                            expected_formula.right.right is not None and
-                            self.nodes_equal(expected_formula.left, expected_formula.right.right)):
-                        # Format: A ∨ ¬A
-                        proposition = expected_formula.left
-                        rule = rule_class(nodes=[proposition], rule_name=line.rule_name)
-                    # Check if it's ¬A ∨ A format
-                    elif (expected_formula.left is not None and
-                          expected_formula.left.value == LogicSymbol.NOT.value and
-                          expected_formula.left.right is not None and
-                          self.nodes_equal(expected_formula.left.right, expected_formula.right)):
-                        # Format: ¬A ∨ A
-                        proposition = expected_formula.right
-                        rule = rule_class(nodes=[proposition], rule_name=line.rule_name)
-                    else:
-                        return f"Invalid Deduction at Line {line.line_number}"
-                # 2. →i - Implication Introduction
-                elif line.rule_name == "→i":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], tuple):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    start, end = line.refs[0]
-                    if start not in line_map or end not in line_map:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    if line_map[start].rule_name != "Assumption":
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    for i in range(start, end + 1):
-                        if i not in valid_lines:
-                            return f"Invalid Deduction at Line {line.line_number}"
-
-                    assumption_node = line_map[start].formula
-                    conclusion_node = line_map[end].formula
-                    rule = rule_class(nodes=[assumption_node, conclusion_node], rule_name=line.rule_name)
-
-                # 3. ¬i - Negation Introduction
-                elif line.rule_name == "¬i":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], tuple):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    start, end = line.refs[0]
-                    if start not in line_map or line_map[start].rule_name != "Assumption":
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    if end not in line_map:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    assumption_node = line_map[start].formula
-                    contradiction_node = line_map[end].formula
-                    rule = rule_class(nodes=[assumption_node, contradiction_node], rule_name=line.rule_name)
-
-                # 4. PBC - Proof by Contradiction
-                elif line.rule_name == "PBC":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], tuple):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    start, end = line.refs[0]
-                    if start not in line_map or line_map[start].rule_name != "Assumption":
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    if end not in line_map:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    assumption_node = line_map[start].formula  # ¬A
-                    contradiction_node = line_map[end].formula  # ⊥
-                    rule = rule_class(nodes=[assumption_node, contradiction_node], rule_name=line.rule_name)
-
-                # 5. ⊥e - False Elimination (Ex Falso Quodlibet)
-                elif line.rule_name == "⊥e":
-                    if len(line.refs) != 1:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    contradiction_ref = line.refs[0]
-                    if isinstance(contradiction_ref, int):
-                        if contradiction_ref not in valid_lines:
-                            return f"Invalid Deduction at Line {line.line_number}"
-                        contradiction_node = line_map[contradiction_ref].formula
-                    else:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    target_node = line.formula
-                    rule = rule_class(nodes=[contradiction_node, target_node], rule_name=line.rule_name)
-
-                # 6. ∨i1 - Or Introduction Left
-                elif line.rule_name == "∨i1":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], int):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    premise_ref = line.refs[0]
-                    if premise_ref not in valid_lines:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    premise_node = line_map[premise_ref].formula
-                    target_node = line.formula
-                    rule = rule_class(nodes=[premise_node, target_node], rule_name=line.rule_name)
-
-                # 7. ∨i2 - Or Introduction Right
-                elif line.rule_name == "∨i2":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], int):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    premise_ref = line.refs[0]
-                    if premise_ref not in valid_lines:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    premise_node = line_map[premise_ref].formula
-                    target_node = line.formula
-                    rule = rule_class(nodes=[premise_node, target_node], rule_name=line.rule_name)
-
-                # 8. ∨e - Or Elimination
-                elif line.rule_name == "∨e":
-                    if len(line.refs) != 3:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    start1, end1 = line.refs[1]
-                    start2, end2 = line.refs[2]
-
-                    if not (start1 < end1 < start2 < end2 < line.line_number):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    disjunction_ref = line.refs[0]
-                    if isinstance(disjunction_ref, int):
-                        if disjunction_ref not in valid_lines:
-                            return f"Invalid Deduction at Line {line.line_number}"
-                        disjunction_node = line_map[disjunction_ref].formula
-                    else:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    if (not isinstance(line.refs[1], tuple) or
-                            not isinstance(line.refs[2], tuple)):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    start1, end1 = line.refs[1]
-                    start2, end2 = line.refs[2]
-
-                    if (start1 not in line_map or end1 not in line_map or
-                            start2 not in line_map or end2 not in line_map):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    if (line_map[start1].rule_name != "Assumption" or
-                            line_map[start2].rule_name != "Assumption"):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    assumption1 = line_map[start1].formula
-                    assumption2 = line_map[start2].formula
-                    conclusion1 = line_map[end1].formula
-                    conclusion2 = line_map[end2].formula
-
-                    if disjunction_node.value != LogicSymbol.OR.value:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    left_disjunct = disjunction_node.left
-                    right_disjunct = disjunction_node.right
-
-                    if not ((self.nodes_equal(assumption1, left_disjunct) and
-                             self.nodes_equal(assumption2, right_disjunct)) or
-                            (self.nodes_equal(assumption1, right_disjunct) and
-                             self.nodes_equal(assumption2, left_disjunct))):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    assumption1_indent = line_map[start1].indent
-                    assumption2_indent = line_map[start2].indent
-
-                    if assumption2_indent > assumption1_indent:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    rule = rule_class(nodes=[disjunction_node, conclusion1, conclusion2], rule_name=line.rule_name)
-                # 9. ∧i - And Introduction
-                elif line.rule_name == "∧i":
-                    if len(line.refs) != 2:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_nodes = []
-                    for ref in line.refs:
-                        if isinstance(ref, int) and ref in valid_lines:
-                            input_nodes.append(line_map[ref].formula)
-                        else:
-                            return f"Invalid Deduction at Line {line.line_number}"
-
-                    rule = rule_class(nodes=input_nodes, rule_name=line.rule_name)
+                rule = check(self, line, rule_class, valid_mask)
+                if rule is None:
+                    return f"Invalid Deduction at Line {line_number}"
 
-                # 10. ∧e1 - And Elimination Left
-                elif line.rule_name == "∧e1":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], int):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    ref = line.refs[0]
-                    if ref not in valid_lines:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_node = line_map[ref].formula
-                    rule = rule_class(nodes=[input_node], rule_name=line.rule_name)
-
-                # 11. ∧e2 - And Elimination Right
-                elif line.rule_name == "∧e2":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], int):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    ref = line.refs[0]
-                    if ref not in valid_lines:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_node = line_map[ref].formula
-                    rule = rule_class(nodes=[input_node], rule_name=line.rule_name)
-
-                # 12. →e - Implication Elimination (Modus Ponens)
-                elif line.rule_name == "→e":
-                    if len(line.refs) != 2:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_nodes = []
-                    for ref in line.refs:
-                        if isinstance(ref, int) and ref in valid_lines:
-                            input_nodes.append(line_map[ref].formula)
-                        else:
-                            return f"Invalid Deduction at Line {line.line_number}"
-
-                    rule = rule_class(nodes=input_nodes, rule_name=line.rule_name)
-
-                # 13. ¬e - Negation Elimination
-                elif line.rule_name == "¬e":
-                    if len(line.refs) != 2:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_nodes = []
-                    for ref in line.refs:
-                        if isinstance(ref, int) and ref in valid_lines:
-                            input_nodes.append(line_map[ref].formula)
-                        else:
-                            return f"Invalid Deduction at Line {line.line_number}"
-
-                    rule = rule_class(nodes=input_nodes, rule_name=line.rule_name)
-
-                # 14. ¬¬e - Double Negation Elimination
-                elif line.rule_name == "¬¬e":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], int):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    ref = line.refs[0]
-                    if ref not in valid_lines:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_node = line_map[ref].formula
-                    rule = rule_class(nodes=[input_node], rule_name=line.rule_name)
-
-                # 15. ¬¬i - Double Negation Introduction
-                elif line.rule_name == "¬¬i":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], int):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    ref = line.refs[0]
-                    if ref not in valid_lines:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_node = line_map[ref].formula
-                    rule = rule_class(nodes=[input_node], rule_name=line.rule_name)
-
-                # 16. MT - Modus Tollens
-                elif line.rule_name == "MT":
-                    if len(line.refs) != 2:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_nodes = []
-                    for ref in line.refs:
-                        if isinstance(ref, int) and ref in valid_lines:
-                            input_nodes.append(line_map[ref].formula)
-                        else:
-                            return f"Invalid Deduction at Line {line.line_number}"
-
-                    rule = rule_class(nodes=input_nodes, rule_name=line.rule_name)
-
-                # 17. Copy - Copy Rule
-                elif line.rule_name == "Copy":
-                    if len(line.refs) != 1 or not isinstance(line.refs[0], int):
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    ref = line.refs[0]
-                    if ref not in valid_lines:
-                        return f"Invalid Deduction at Line {line.line_number}"
-
-                    input_node = line_map[ref].formula
-                    rule = rule_class(nodes=[input_node], rule_name=line.rule_name)
-
-                # Unknown rule
-                else:
-                    return f"Invalid Deduction at Line {line.line_number}"
                 expected_node = rule.apply()
 
-                if not rule._nodes_equal(expected_node, line.formula):
-                    return f"Invalid Deduction at Line {line.line_number}"
+                if not rule._nodes_equal(expected_node, formula):
+                    return f"Invalid Deduction at Line {line_number}"
 
-                scope_stack[-1].add(line.line_number)
-                valid_lines.add(line.line_number)
+                valid_mask |= line.bit
 
             except LogicRuleError as e:
-                return f"Invalid Deduction at Line {line.line_number}"
+                return f"Invalid Deduction at Line {line_number}"
             except Exception as e:
-                return f"Invalid Deduction at Line {line.line_number}"
+                return f"Invalid Deduction at Line {line_number}"
 
         return "Valid Deduction"
 
-    def nodes_equal(self, node1: Node, node2: Node) -> bool:
-        if node1 is None and node2 is None:
-            return True
-        if node1 is None or node2 is None:
-            return False
-        if node1.value != node2.value:
-            return False
+    # Rule checks: each one validates the references of a line and returns the
+    # rule to apply, or None when the line cannot be justified that way.
+
+    def _check_lem(self, line: LogicLine, rule_class: RuleClass,
+                   valid_mask: int) -> Optional[AnyRule]:
+        """LEM: no references, and the formula must be A ∨ ¬A or ¬A ∨ A."""
+        if len(line.refs) != 0:
+            return None
+
+        expected_formula = line.formula
+        if expected_formula is None or expected_formula.value != LogicSymbol.OR.value:
+            return None
+
+        # check if it's A ∨ ¬A format
+        if (expected_formula.right is not None and
+                expected_formula.right.value == LogicSymbol.NOT.value and
+                expected_formula.right.right is not None and
+                self.nodes_equal(expected_formula.left, expected_formula.right.right)):
+            # Format: A ∨ ¬A
+            proposition = expected_formula.left
+        # Check if it's ¬A ∨ A format
+        elif (expected_formula.left is not None and
+              expected_formula.left.value == LogicSymbol.NOT.value and
+              expected_formula.left.right is not None and
+              self.nodes_equal(expected_formula.left.right, expected_formula.right)):
+            # Format: ¬A ∨ A
+            proposition = expected_formula.right
+        else:
+            return None
+        return rule_class(nodes=[proposition], rule_name=line.rule_name)
+
+    def _check_imp_intro(self, line: LogicLine, rule_class: RuleClass,
+                         valid_mask: int) -> Optional[AnyRule]:
+        """→i: the box must open with an assumption and every line in it must hold."""
+        if len(line.refs) != 1 or not isinstance(line.refs[0], tuple):
+            return None
+
+        start_line, end_line = line.range_lines[0]
+        if start_line is None or end_line is None:
+            return None
+
+        if start_line.rule_name != "Assumption":
+            return None
+
+        need = line.range_masks[0]
+        if valid_mask & need != need:
+            return None
+
+        assumption_node = start_line.formula
+        conclusion_node = end_line.formula
+        if assumption_node is None or conclusion_node is None:
+            return None
+        return rule_class(nodes=[assumption_node, conclusion_node], rule_name=line.rule_name)
+
+    def _check_contradiction_box(self, line: LogicLine, rule_class: RuleClass,
+                                 valid_mask: int) -> Optional[AnyRule]:
+        """¬i and PBC: an assumption box ending in the contradiction."""
+        if len(line.refs) != 1 or not isinstance(line.refs[0], tuple):
+            return None
+
+        start_line, end_line = line.range_lines[0]
+        if start_line is None or start_line.rule_name != "Assumption":
+            return None
+
+        if end_line is None:
+            return None
+
+        assumption_node = start_line.formula
+        contradiction_node = end_line.formula  # ⊥
+        if assumption_node is None or contradiction_node is None:
+            return None
+        return rule_class(nodes=[assumption_node, contradiction_node], rule_name=line.rule_name)
+
+    def _check_ref_and_target(self, line: LogicLine, rule_class: RuleClass,
+                              valid_mask: int) -> Optional[AnyRule]:
+        """⊥e, ∨i1 and ∨i2: one valid line plus the formula being derived."""
+        if len(line.refs) != 1 or len(line.int_refs) != 1:
+            return None
+
+        if valid_mask & line.int_mask != line.int_mask or line.formula is None:
+            return None
+
+        return rule_class(nodes=[line.int_nodes[0], line.formula], rule_name=line.rule_name)
+
+    def _check_or_elim(self, line: LogicLine, rule_class: RuleClass,
+                       valid_mask: int) -> Optional[AnyRule]:
+        """∨e: a valid disjunction and two assumption boxes, one per disjunct."""
+        refs = line.refs
+        if len(refs) != 3 or line.line_number is None:
+            return None
+
+        disjunction_ref, box1, box2 = refs
+        if (not isinstance(disjunction_ref, int) or
+                not isinstance(box1, tuple) or
+                not isinstance(box2, tuple)):
+            return None
+
+        start1, end1 = box1
+        start2, end2 = box2
+
+        if not (start1 < end1 < start2 < end2 < line.line_number):
+            return None
+
+        if valid_mask & line.int_mask != line.int_mask:
+            return None
+        disjunction_node = line.int_nodes[0]
+
+        (start1_line, end1_line), (start2_line, end2_line) = line.range_lines
+        if (start1_line is None or end1_line is None or
+                start2_line is None or end2_line is None):
+            return None
+
+        if (start1_line.rule_name != "Assumption" or
+                start2_line.rule_name != "Assumption"):
+            return None
+
+        assumption1 = start1_line.formula
+        assumption2 = start2_line.formula
+        conclusion1 = end1_line.formula
+        conclusion2 = end2_line.formula
+        if conclusion1 is None or conclusion2 is None:
+            return None
+
+        if disjunction_node.value != LogicSymbol.OR.value:
+            return None
+
+        left_disjunct = disjunction_node.left
+        right_disjunct = disjunction_node.right
+
+        if not ((self.nodes_equal(assumption1, left_disjunct) and
+                 self.nodes_equal(assumption2, right_disjunct)) or
+                (self.nodes_equal(assumption1, right_disjunct) and
+                 self.nodes_equal(assumption2, left_disjunct))):
+            return None
+
+        assumption1_indent = start1_line.indent
+        assumption2_indent = start2_line.indent
+
+        if assumption2_indent > assumption1_indent:
+            return None
+
+        return rule_class(nodes=[disjunction_node, conclusion1, conclusion2], rule_name=line.rule_name)
+
+    def _check_one_ref(self, line: LogicLine, rule_class: RuleClass,
+                       valid_mask: int) -> Optional[AnyRule]:
+        """∧e1, ∧e2, ¬¬e, ¬¬i and Copy: the rule applies to one valid line."""
+        if len(line.refs) != 1 or len(line.int_refs) != 1:
+            return None
+
+        if valid_mask & line.int_mask != line.int_mask:
+            return None
+
+        return rule_class(nodes=line.int_nodes, rule_name=line.rule_name)
+
+    def _check_two_refs(self, line: LogicLine, rule_class: RuleClass,
+                        valid_mask: int) -> Optional[AnyRule]:
+        """∧i, →e, ¬e and MT: the rule applies to two valid lines."""
+        if len(line.refs) != 2 or len(line.int_refs) != 2:
+            return None
+
+        if valid_mask & line.int_mask != line.int_mask:
+            return None
+
+        return rule_class(nodes=line.int_nodes, rule_name=line.rule_name)
+
+    # Rule name -> (rule class, check); validate() calls check(self, ...).
+    # Premise and Assumption lines are handled by validate() itself.
+    _RULES: Dict[str, Tuple[RuleClass, RuleCheck]] = {
+        "LEM": (LEM, _check_lem),
+        "→i": (ImpIntro, _check_imp_intro),
+        "¬i": (NegIntro, _check_contradiction_box),
+        "PBC": (PBC, _check_contradiction_box),
+        "⊥e": (FalseElim, _check_ref_and_target),
+        "∨i1": (OrIntroLeft, _check_ref_and_target),
+        "∨i2": (OrIntroRight, _check_ref_and_target),
+        "∨e": (OrElim, _check_or_elim),
+        "∧i": (AndIntro, _check_two_refs),
+        "→e": (ImpElim, _check_two_refs),
+        "¬e": (NegElim, _check_two_refs),
+        "MT": (ModusTollens, _check_two_refs),
+        "∧e1": (AndElimLeft, _check_one_ref),
+        "∧e2": (AndElimRight, _check_one_ref),
+        "¬¬e": (DoubleNegElim, _check_one_ref),
+        "¬¬i": (DoubleNegIntro, _check_one_ref),
+        "Copy": (CopyRule, _check_one_ref),
+    }
+
+    @staticmethod
+    def _resolve_refs(lines: List[LogicLine]) -> ParsedProof:
+        """Split each line's refs by kind and look up the referenced formulas and
+        box lines once, so the rule checks can index them directly."""
+        line_map = {line.line_number: line for line in lines if line.line_number is not None}
+        bits = {num: 1 << i for i, num in enumerate(line_map)}
+        missing = 1 << len(bits)  # never valid, so a missing line never checks out
+        for line in lines:
+            if line.line_number is not None:
+                line.bit = bits[line.line_number]
+            line.int_refs = [ref for ref in line.refs if isinstance(ref, int)]
+            line.range_refs = [ref for ref in line.refs if isinstance(ref, tuple)]
+            line.int_nodes = []
+            for ref in line.int_refs:
+                target = line_map.get(ref)
+                if target is not None and target.formula is not None:
+                    line.int_nodes.append(target.formula)
+            line.int_mask = 0
+            for ref in line.int_refs:
+                line.int_mask |= bits.get(ref, missing)
+            line.range_lines = [(line_map.get(start), line_map.get(end))
+                                for start, end in line.range_refs]
+            line.range_masks = [_range_mask(bits, missing, start, end)
+                                for start, end in line.range_refs]
+
+        premise_mask = 0
+        for line in line_map.values():
+            if line.rule_name == "Premise":
+                premise_mask |= line.bit
+        return ParsedProof(tuple(lines), premise_mask)
+
+    def nodes_equal(self, node1: Optional[Node], node2: Optional[Node]) -> bool:
+        # Node equality is structural; two missing nodes still compare equal.
+        return node1 == node2
 
-        left_equal = self.nodes_equal(node1.left, node2.left)
-        right_equal = self.nodes_equal(node1.right, node2.right)
 
-        return left_equal and right_equal
+def rule_name_to_class(name: str) -> Optional[RuleClass]:
+    if name == "Assumption":
+        return Assumption
+    entry = Phase5._RULES.get(name)
+    return entry[0] if entry is not None else None
@@ -0,0 +1,50 @@
+from functools import lru_cache
+
+import pytest
+
+from phases.phase1.logic import Phase1
+from phases.phase2.logic import Phase2
+from phases.phase3.main import Phase3
+from phases.phase4.logic import Phase4
+from phases.phase5.logic import Phase5
+
+_phase1 = Phase1()
+_phase2 = Phase2()
+
+
+# The phases keep no per-call state, so every test (and, under pytest-xdist,
+# every worker) shares a single instance of each.
+@pytest.fixture(scope="session")
+def phase1():
+    return _phase1
+
+
+@pytest.fixture(scope="session")
+def phase2():
+    return _phase2
+
+
+@pytest.fixture(scope="session")
+def phase3():
+    return Phase3()
+
+
+@pytest.fixture(scope="session")
+def phase4():
+    return Phase4()
+
+
+@pytest.fixture(scope="session")
+def phase5():
+    return Phase5()
+
+
+@lru_cache(maxsize=None)
+def _cnf(expr: str) -> str:
+    """Convert each distinct formula to CNF once per test session."""
+    return _phase2.process(expr)
+
+
+@pytest.fixture(scope="session")
+def cnf():
+    return _cnf
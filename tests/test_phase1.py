@@ -1,10 +1,3 @@
-import pytest
-from phases.phase1.logic import Phase1
-
-@pytest.fixture
-def phase1():
-    return Phase1()
-
 def test_valid_formula_simple(phase1):
     expr = "a"
     expected_output = "Valid Formula\n" \
@@ -86,11 +79,6 @@ def test_valid_formula_complex_1(phase1):
                       "      r"
     assert phase1.process(expr) == expected_output
 
-def test_invalid_formula_missing_paren(phase1):
-    expr = "(p ∧ q"
-    expected_output = "Invalid Formula"
-    assert phase1.process(expr) == expected_output
-
 def test_valid_formula_single_var(phase1):
     expr = "p"
     expected_output = "Valid Formula\n" \
@@ -125,3 +113,11 @@ def test_invalid_formula_unexpected_operator(phase1):
     expr = "¬ ∧ q"
     expected_output = "Invalid Formula"
     assert phase1.process(expr) == expected_output
+
+def test_node_equality_is_structural(phase1):
+    first = phase1.parse_tree("(p ∧ q) → r")
+    second = phase1.parse_tree("(p ∧ q) → r")
+    assert first is not second
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != phase1.parse_tree("(q ∧ p) → r")
@@ -1,99 +1,101 @@
 import pytest
 
-from phases.phase1.logic import Phase1
-from phases.phase2.logic import Phase2
+from tests.conftest import _phase1, _phase2
 
-@pytest.fixture
-def phase2():
-    return Phase2()
+# Expected renderings are invariant, so build them once at import
+# with the instances the session fixtures share
+EXP_IMPL = _phase2.tree_to_string(_phase1.parse_tree("¬p ∨ q"))
+EXP_BICOND = _phase2.tree_to_string(_phase1.parse_tree("(¬p ∨ q) ∧ (¬q ∨ p)"))
+EXP_NESTED = _phase2.tree_to_string(_phase1.parse_tree("(¬(¬p ∨ q) ∨ ¬r ∨ s) ∧ (¬(¬r ∨ s) ∨ ¬p ∨ q)"))
+EXP_SINGLE = _phase2.tree_to_string(_phase1.parse_tree("a"))
 
-def test_eliminates_implication_correctly(phase2):
+def test_eliminates_implication_correctly(phase1, phase2):
     expr = "p → q"
-    expected_output = phase2.tree_to_string(Phase1().parse_tree("¬p ∨ q"))
-    actual_output = phase2.eliminate_implications(Phase1().parse_tree(expr))
+    expected_output = EXP_IMPL
+    actual_output = phase2.eliminate_implications(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_eliminates_biconditional_correctly(phase2):
+def test_eliminates_biconditional_correctly(phase1, phase2):
     expr = "p ↔ q"
-    expected_output = phase2.tree_to_string(Phase1().parse_tree("(¬p ∨ q) ∧ (¬q ∨ p)"))
-    actual_output = phase2.eliminate_implications(Phase1().parse_tree(expr))
+    expected_output = EXP_BICOND
+    actual_output = phase2.eliminate_implications(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_handles_nested_implications_and_biconditionals(phase2):
+def test_handles_nested_implications_and_biconditionals(phase1, phase2):
     expr = "(p → q) ↔ (r → s)"
-    expected_output = phase2.tree_to_string(Phase1().parse_tree("(¬(¬p ∨ q) ∨ ¬r ∨ s) ∧ (¬(¬r ∨ s) ∨ ¬p ∨ q)"))
-    actual_output = phase2.eliminate_implications(Phase1().parse_tree(expr))
+    expected_output = EXP_NESTED
+    actual_output = phase2.eliminate_implications(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_handles_single_variable(phase2):
+def test_handles_single_variable(phase1, phase2):
     expr = "a"
-    expected_output = phase2.tree_to_string(Phase1().parse_tree("a"))
-    actual_output = phase2.eliminate_implications(Phase1().parse_tree(expr))
+    expected_output = EXP_SINGLE
+    actual_output = phase2.eliminate_implications(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
 def test_handles_empty_node(phase2):
     assert phase2.eliminate_implications(None) is None
 
-def test_eliminates_double_negation(phase2):
+def test_eliminates_double_negation(phase1, phase2):
     expr = "¬(¬a)"
     expected_output = "a"
-    actual_output = phase2.move_negations_inward(Phase1().parse_tree(expr))
+    actual_output = phase2.move_negations_inward(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_applies_de_morgan_to_or(phase2):
+def test_applies_de_morgan_to_or(phase1, phase2):
     expr = "¬(a ∨ b)"
     expected_output = "¬a ∧ ¬b"
-    actual_output = phase2.move_negations_inward(Phase1().parse_tree(expr))
+    actual_output = phase2.move_negations_inward(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_applies_de_morgan_to_and(phase2):
+def test_applies_de_morgan_to_and(phase1, phase2):
     expr = "¬(a ∧ b)"
     expected_output = "¬a ∨ ¬b"
-    actual_output = phase2.move_negations_inward(Phase1().parse_tree(expr))
+    actual_output = phase2.move_negations_inward(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_handles_single_negation(phase2):
+def test_handles_single_negation(phase1, phase2):
     expr = "¬a"
     expected_output = "¬a"
-    actual_output = phase2.move_negations_inward(Phase1().parse_tree(expr))
+    actual_output = phase2.move_negations_inward(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
 def test_handles_empty_node_for_negation(phase2):
     assert phase2.move_negations_inward(None) is None
 
-def test_distributes_or_over_and_with_nested_and_or(phase2):
+def test_distributes_or_over_and_with_nested_and_or(phase1, phase2):
     expr = "(a ∧ b) ∨ (c ∧ d)"
     expected_output = "(a ∨ c) ∧ (a ∨ d) ∧ (b ∨ c) ∧ (b ∨ d)"
-    actual_output = phase2.distribute_or_over_and(Phase1().parse_tree(expr))
+    actual_output = phase2.distribute_or_over_and(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_distributes_or_over_and_with_left_and(phase2):
+def test_distributes_or_over_and_with_left_and(phase1, phase2):
     expr = "(a ∧ b) ∨ c"
     expected_output = "(a ∨ c) ∧ (b ∨ c)"
-    actual_output = phase2.distribute_or_over_and(Phase1().parse_tree(expr))
+    actual_output = phase2.distribute_or_over_and(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_distributes_or_over_and_with_right_and(phase2):
+def test_distributes_or_over_and_with_right_and(phase1, phase2):
     expr = "a ∨ (b ∧ c)"
     expected_output = "(a ∨ b) ∧ (a ∨ c)"
-    actual_output = phase2.distribute_or_over_and(Phase1().parse_tree(expr))
+    actual_output = phase2.distribute_or_over_and(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
-def test_handles_single_variable_or(phase2):
+def test_handles_single_variable_or(phase1, phase2):
     expr = "a ∨ b"
     expected_output = "a ∨ b"
-    actual_output = phase2.distribute_or_over_and(Phase1().parse_tree(expr))
+    actual_output = phase2.distribute_or_over_and(phase1.parse_tree(expr))
     actual_output_str = phase2.tree_to_string(actual_output)
     assert actual_output_str == expected_output
 
@@ -101,7 +103,15 @@ def test_handles_empty_node_for_or_and_distribution(phase2):
     assert phase2.distribute_or_over_and(None) is None
 
 
-@pytest.mark.parametrize("expr, expected", [
+# Normalize space to avoid false negatives due to formatting
+_STRIP_SPACES = str.maketrans("", "", " ")
+
+
+def _normalize(expr):
+    return expr.translate(_STRIP_SPACES)
+
+
+CNF_CASES = [
     ("¬(p ∧ q)", "¬p ∨ ¬q"),
 
     ("p ∨ (q ∧ r)", "(p ∨ q) ∧ (p ∨ r)"),
@@ -163,16 +173,15 @@ def test_handles_empty_node_for_or_and_distribution(phase2):
     ("A ∨ B", "A ∨ B"),
 
     ("A → (B → (C → (D → (E → F))))", "¬A ∨ ¬B ∨ ¬C ∨ ¬D ∨ ¬E ∨ F"),
-])
-def test_cnf_conversion(expr, expected):
-    phase2 = Phase2()
-    result = phase2.process(expr)
+]
 
-    # Normalize space to avoid false negatives due to formatting
-    def normalize(expr1):
-        return expr1.replace(" ", "")
 
-    assert normalize(result) == normalize(expected), f"Expected: {expected}, Got: {result}"
+# Expected sides are normalized once here rather than on every run
+@pytest.mark.parametrize("expr, expected", [(expr, _normalize(expected)) for expr, expected in CNF_CASES],
+                         ids=[f"c{i}" for i in range(len(CNF_CASES))])
+def test_cnf_conversion(cnf, expr, expected):
+    result = cnf(expr)
+    assert _normalize(result) == expected, f"Expected: {expected}, Got: {result}"
 
 
 # Additional test cases for edge cases and error handling
@@ -183,10 +192,9 @@ def test_cnf_conversion(expr, expected):
     ("A ∨ B ∨ C", "Simple disjunction"),
     ("¬A ∨ ¬B ∨ C", "Mixed literals"),
 ])
-def test_cnf_already_in_cnf(expr, description):
+def test_cnf_already_in_cnf(cnf, expr, description):
     """Test cases where input is already in CNF or close to it"""
-    phase2 = Phase2()
-    result = phase2.process(expr)
+    result = cnf(expr)
     # Should not throw errors and should produce valid output
     assert result is not None
     assert len(result) > 0
@@ -195,7 +203,8 @@ def test_cnf_already_in_cnf(expr, description):
 @pytest.mark.parametrize("expr", [
     "A → (B → (C → (D → (E → (F → G)))))",
 
-    "(A ↔ B) ↔ (C ↔ (D ↔ E))",
+    # Nested biconditionals blow up exponentially when distributed into CNF
+    pytest.param("(A ↔ B) ↔ (C ↔ (D ↔ E))", marks=pytest.mark.slow),
 
     "¬(((A → B) ∧ (C ↔ D)) ∨ ¬((E → F) ∧ (G ↔ H)))",
 
@@ -203,9 +212,8 @@ def test_cnf_already_in_cnf(expr, description):
 
     "(A ∨ B ∨ C) ∧ (D ∨ (E ∧ F ∧ G))",
 ])
-def test_cnf_complex_structures(expr):
-    phase2 = Phase2()
-    result = phase2.process(expr)
+def test_cnf_complex_structures(cnf, expr):
+    result = cnf(expr)
     # Should not throw errors and should produce valid output
     assert result is not None
     assert len(result) > 0
@@ -213,22 +221,22 @@ def test_cnf_complex_structures(expr):
     assert "→" not in result
     assert "↔" not in result
 
-def test_implies_to_or_simple(phase2):
+def test_implies_to_or_simple(cnf):
     expr = "p → q"
     expected_output = "¬p ∨ q"
-    assert phase2.process(expr) == expected_output
+    assert cnf(expr) == expected_output
 
-def test_implies_with_and(phase2):
+def test_implies_with_and(cnf):
     expr = "(q → r) ∧ p"
     expected_output = "(¬q ∨ r) ∧ p"
-    assert phase2.process(expr) == expected_output
+    assert cnf(expr) == expected_output
 
-def test_nested_implies_or_not(phase2):
+def test_nested_implies_or_not(cnf):
     expr = "(p → (¬((¬r) ∧ q))) ∨ s"
     expected_output = "¬p ∨ r ∨ ¬q ∨ s"
-    assert phase2.process(expr) == expected_output
+    assert cnf(expr) == expected_output
 
-def test_double_nested_implies(phase2):
+def test_double_nested_implies(cnf):
     expr = "p → ((q → r) → s)"
     expected_output = "(¬p ∨ q ∨ s) ∧ (¬p ∨ ¬r ∨ s)"
-    assert phase2.process(expr) == expected_output
+    assert cnf(expr) == expected_output
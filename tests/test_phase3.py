@@ -1,24 +1,19 @@
-import re
-from phases.phase3.main import Phase3
 import pytest
 import ast
 
-@pytest.fixture
-def phase3():
-    return Phase3()
-
 def parse_output(output: str):
-    lines = output.strip().split('\n')
-    status = lines[0].strip()
-    variables = set()
-    if len(lines) > 1:
-        variables_str = re.findall(r"\{.*\}", lines[1])
-        if variables_str:
-            variables = set(eval(variables_str[0]))
-    return status, variables
-
-
-@pytest.mark.parametrize("input_data, expected_status, expected_vars", [
+    out = output.strip()
+    nl = out.find('\n')
+    status = (out[:nl] if nl >= 0 else out).strip()
+    rest = out[nl + 1:] if nl >= 0 else ""
+    lb, rb = rest.find('{'), rest.rfind('}')
+    if lb < 0 or rb < lb:
+        return status, set()
+    inner = rest[lb + 1:rb]
+    return status, {tok.strip().strip("'\"") for tok in inner.split(",") if tok.strip()}
+
+
+HORN_CASES = [
     ("(⊤→A)∧(A→B)∧(B→C)∧(A∧C→D)∧(D→E)", "Satisfiable", {'A', 'B', 'C', 'D', 'E'}),
 
     ("(⊤→A)∧(A→B)∧(B→C)∧(C→⊥)", "Unsatisfiable", set()),
@@ -83,7 +78,14 @@ def parse_output(output: str):
 
     ("(⊤→A)∧(A→B)∧(A→C)∧(B∧C→D)∧(D→E)∧(E→F)∧(F∧B→G)∧(G∧C→H)∧(H∧D→I)∧(I∧E→J)∧(J→K)∧(K∧A→L)",
      "Satisfiable", {'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L'}),
-])
+
+    ("(⊤→A)∧(A∧A→B)∧(B∧A∧B→C)",
+     "Satisfiable", {'A', 'B', 'C'}),
+]
+
+
+@pytest.mark.parametrize("input_data, expected_status, expected_vars", HORN_CASES,
+                         ids=[f"c{i}" for i in range(len(HORN_CASES))])
 def test_horn_solver_valid(phase3, input_data, expected_status, expected_vars):
     output = phase3.process(input_data)
     status, variables = parse_output(output)
@@ -98,7 +100,7 @@ def test_horn_solver_invalid(phase3):
     assert "Invalid Horn Formula" in output
 
 
-@pytest.mark.parametrize("input_data, expected_status", [
+HORN_EDGE_CASES = [
     ("(A→⊤)∧(B→⊤)∧(C→⊤)", "Satisfiable"),
 
     ("(A→⊥)∧(B→⊥)∧(C→⊥)", "Satisfiable"),
@@ -108,7 +110,11 @@ def test_horn_solver_invalid(phase3):
     ("(⊤→A)∧(A→B)∧(A→C)∧(B→D)∧(C→D)∧(D→E)∧(E→⊥)∧(B→F)∧(F→⊥)", "Unsatisfiable"),
 
     ("(⊤→A)∧(A→B)∧(A→B)∧(B→C)∧(B→C)∧(C→D)∧(D→E)∧(E→F)", "Satisfiable"),
-])
+]
+
+
+@pytest.mark.parametrize("input_data, expected_status", HORN_EDGE_CASES,
+                         ids=[f"c{i}" for i in range(len(HORN_EDGE_CASES))])
 def test_horn_solver_edge_cases(phase3, input_data, expected_status):
     output = phase3.process(input_data)
     status, _ = parse_output(output)
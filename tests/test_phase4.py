@@ -1,11 +1,7 @@
 import pytest
-from phases.phase4.logic import Phase4, LogicLine, LogicRuleError
+from phases.phase4.logic import LogicLine, LogicRuleError
 from phases.phase1.logic import Node
 
-@pytest.fixture
-def phase4():
-    return Phase4()
-
 def create_node(value: str, left=None, right=None) -> Node:
     """Helper to create Node objects"""
     node = Node(value)
@@ -205,6 +201,15 @@ def test_extra_whitespace_handling(phase4):
     result = phase4.process(input_data)
     assert result == "A ∧ B"
 
+@pytest.mark.parametrize("input_data", [
+    "1    A    B\n2    C\n∧i, 1, 2",
+    "1    A\n2    B    \n∧i, 1, 2",
+    "1    (A ∧     B)\n∧e1, 1",
+])
+def test_extra_field_on_premise_line(phase4, input_data):
+    """A second 4-space separator on a premise line is rejected"""
+    assert phase4.process(input_data) == "Rule Cannot Be Applied"
+
 def test_large_line_numbers(phase4):
     """Test with very large line numbers"""
     input_data = "999999    A\n1000000    B\n∧i,999999,1000000"
@@ -309,10 +314,6 @@ def test_line_numbers_with_leading_zeros(phase4):
     result = phase4.process(input_data)
     assert result == "A ∧ B"
 
-
-
-
-####
 def test_and_intro_simple(phase4):
     expr = "1    p ∧ q\n2    r\n∧i, 1, 2"
     expected_output = "p ∧ q ∧ r"
@@ -3,54 +3,34 @@ from typing import List, Optional, Dict, Type, Union, Tuple
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
-from phases.phase5.logic import Phase5
+from phases.phase5.logic import NaturalDeductionParser, Phase5, commutative_key
 
-@pytest.fixture
-def phase5():
-    return Phase5()
+# (id, proof text, expected verdict)
+CASES = [
+    # Test basic premise validation
+    ("valid_basic_premise", "1    p        Premise",
+     "Valid Deduction"),
 
-
-def test_valid_basic_premise():
-    """Test basic premise validation"""
-    phase5 = Phase5()
-    input_data = "1    p        Premise"
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
-
-def test_valid_simple_and_introduction():
-    """Test simple and introduction"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test simple and introduction
+    ("valid_simple_and_introduction", """1    p        Premise
 2    q        Premise
-3    p ∧ q        ∧i, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
+3    p ∧ q        ∧i, 1, 2""",
+     "Valid Deduction"),
 
-def test_valid_and_elimination():
-    """Test and elimination rules"""
-    phase5 = Phase5()
-    input_data = """1    p ∧ q        Premise
+    # Test and elimination rules
+    ("valid_and_elimination", """1    p ∧ q        Premise
 2    p        ∧e1, 1
-3    q        ∧e2, 1"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
+3    q        ∧e2, 1""",
+     "Valid Deduction"),
 
-def test_valid_implication_elimination():
-    """Test modus ponens"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
+    # Test modus ponens
+    ("valid_implication_elimination", """1    p → q        Premise
 2    p        Premise
-3    q        →e, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+3    q        →e, 1, 2""",
+     "Valid Deduction"),
 
-def test_valid_complex_or_elimination():
-    """Test the provided example 1 - complex or elimination"""
-    phase5 = Phase5()
-    input_data = """ 1    (¬p) ∨ q        Premise
+    # Test the provided example 1 - complex or elimination
+    ("valid_complex_or_elimination", """ 1    (¬p) ∨ q        Premise
       BeginScope
  2      ¬p        Assumption
         BeginScope
@@ -68,28 +48,20 @@ def test_valid_complex_or_elimination():
         EndScope
 10      p → q        →i, 8-9
       EndScope
-11    p → q        ∨e, 1, 2-6, 7-10"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
+11    p → q        ∨e, 1, 2-6, 7-10""",
+     "Valid Deduction"),
 
-def test_valid_implication_introduction():
-    """Test implication introduction"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test implication introduction
+    ("valid_implication_introduction", """1    p        Premise
       BeginScope
  2      q        Assumption
  3      p        Copy, 1
       EndScope
- 4    q → p        →i, 2-3"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
+ 4    q → p        →i, 2-3""",
+     "Valid Deduction"),
 
-def test_valid_negation_introduction():
-    """Test negation introduction"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
+    # Test negation introduction
+    ("valid_negation_introduction", """1    p → q        Premise
 2    p → ¬q        Premise
       BeginScope
  3      p        Assumption
@@ -97,15 +69,11 @@ def test_valid_negation_introduction():
  5      ¬q        →e, 2, 3
  6      ⊥        ¬e, 4, 5
       EndScope
- 7    ¬p        ¬i, 3-6"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+ 7    ¬p        ¬i, 3-6""",
+     "Valid Deduction"),
 
-
-def test_valid_proof_by_contradiction():
-    """Test proof by contradiction"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
+    # Test proof by contradiction
+    ("valid_proof_by_contradiction", """1    p → q        Premise
 2    q → r        Premise
 3    ¬r        Premise
 4    p        Premise
@@ -113,87 +81,65 @@ def test_valid_proof_by_contradiction():
  5      ¬p        Assumption
  6      ⊥        ¬e, 4, 5
       EndScope
- 7    p        PBC, 5-6"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+ 7    p        PBC, 5-6""",
+     "Valid Deduction"),
 
+    # Test double negation elimination
+    ("valid_double_negation_elimination", """1    ¬(¬p)        Premise
+2    p        ¬¬e, 1""",
+     "Valid Deduction"),
 
-def test_valid_double_negation_elimination():
-    """Test double negation elimination"""
-    phase5 = Phase5()
-    input_data = """1    ¬(¬p)        Premise
-2    p        ¬¬e, 1"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
-
-def test_valid_modus_tollens():
-    """Test modus tollens"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
+    # Test modus tollens
+    ("valid_modus_tollens", """1    p → q        Premise
 2    ¬q        Premise
-3    ¬p        MT, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+3    ¬p        MT, 1, 2""",
+     "Valid Deduction"),
 
-def test_valid_false_elimination():
-    """Test false elimination (ex falso quodlibet)"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test false elimination (ex falso quodlibet)
+    ("valid_false_elimination", """1    p        Premise
 2    ¬p        Premise
 3    ⊥        ¬e, 1, 2
-4    q        ⊥e, 3"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
+4    q        ⊥e, 3""",
+     "Valid Deduction"),
 
-def test_invalid_wrong_formula_and_introduction():
-    """Test invalid and introduction with wrong formula"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test invalid and introduction with wrong formula
+    ("invalid_wrong_formula_and_introduction", """1    p        Premise
 2    q        Premise
-3    p ∧ r        ∧i, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 3"
-
+3    p ∧ r        ∧i, 1, 2""",
+     "Invalid Deduction at Line 3"),
 
-def test_invalid_scope_access_violation():
-    """Test the provided example 2 - scope access violation"""
-    phase5 = Phase5()
-    input_data = """ 1    p → q        Premise
+    # Test the provided example 2 - scope access violation
+    ("invalid_scope_access_violation", """ 1    p → q        Premise
  2    s        Premise
       BeginScope
  3      p        Assumption
  4      q        →e, 1, 3
       EndScope
- 5    s ∧ q        ∧i, 4, 2"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 5"
+ 5    s ∧ q        ∧i, 4, 2""",
+     "Invalid Deduction at Line 5"),
 
+    # Test referencing non-existent line
+    ("invalid_nonexistent_line_reference", """1    p        Premise
+2    q        →e, 1, 10""",
+     "Invalid Deduction at Line 2"),
 
-def test_invalid_nonexistent_line_reference():
-    """Test referencing non-existent line"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
-2    q        →e, 1, 10"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 2"
+    # Test very large line numbers
+    ("valid_large_line_numbers", """100000000    p        Premise
+100000001    p        Copy, 100000000""",
+     "Valid Deduction"),
 
+    ("invalid_large_nonexistent_line_reference", """1    p        Premise
+2    q        →e, 1, 300000000""",
+     "Invalid Deduction at Line 2"),
 
-def test_invalid_wrong_rule_application():
-    """Test wrong rule application"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test wrong rule application
+    ("invalid_wrong_rule_application", """1    p        Premise
 2    q        Premise
-3    p → q        ∧i, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 3"
-
+3    p → q        ∧i, 1, 2""",
+     "Invalid Deduction at Line 3"),
 
-def test_invalid_or_elimination_different_conclusions():
-    """Test or elimination with different conclusions"""
-    phase5 = Phase5()
-    input_data = """1    p ∨ q        Premise
+    # Test or elimination with different conclusions
+    ("invalid_or_elimination_different_conclusions", """1    p ∨ q        Premise
 2    r        Premise
 3    s        Premise
       BeginScope
@@ -204,32 +150,22 @@ def test_invalid_or_elimination_different_conclusions():
  6      q        Assumption
  7      s        Copy, 3
       EndScope
- 8    r        ∨e, 1, 4-5, 6-7"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 8"
+ 8    r        ∨e, 1, 4-5, 6-7""",
+     "Invalid Deduction at Line 8"),
 
-def test_invalid_negation_elimination_not_contradiction():
-    """Test negation elimination without contradiction"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test negation elimination without contradiction
+    ("invalid_negation_elimination_not_contradiction", """1    p        Premise
 2    ¬p        Premise
-3    q        ¬e, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 3"
+3    q        ¬e, 1, 2""",
+     "Invalid Deduction at Line 3"),
 
+    # Test unmatched EndScope
+    ("invalid_unmatched_end_scope", """1    p        Premise
+      EndScope""",
+     "Invalid Deduction: unmatched EndScope"),
 
-def test_invalid_unmatched_end_scope():
-    """Test unmatched EndScope"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
-      EndScope"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction: unmatched EndScope"
-
-def test_complex_nested_scopes_valid():
-    """Test complex nested scopes - valid case"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test complex nested scopes - valid case
+    ("complex_nested_scopes_valid", """1    p        Premise
       BeginScope
  2      q        Assumption
         BeginScope
@@ -238,62 +174,39 @@ def test_complex_nested_scopes_valid():
         EndScope
  5      r → (p ∧ r)        →i, 3-4
       EndScope
- 6    q → (r → (p ∧ r))        →i, 2-5"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+ 6    q → (r → (p ∧ r))        →i, 2-5""",
+     "Valid Deduction"),
 
-
-def test_complex_proof_with_multiple_rules():
-    """Test complex proof combining multiple rules"""
-    phase5 = Phase5()
-    input_data = """1    (p ∧ q) → r        Premise
+    # Test complex proof combining multiple rules
+    ("complex_proof_with_multiple_rules", """1    (p ∧ q) → r        Premise
 2    p        Premise
 3    q        Premise
 4    p ∧ q        ∧i, 2, 3
 5    r        →e, 1, 4
 6    ¬(¬r)        ¬¬i, 5
-7    r        ¬¬e, 6"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+7    r        ¬¬e, 6""",
+     "Valid Deduction"),
 
+    # Test empty input
+    ("empty_input", "",
+     "Valid Deduction"),
 
-def test_invalid_malformed_input():
-    """Test malformed input handling"""
-    phase5 = Phase5()
-    input_data = "invalid line format"
-    result = phase5.process(input_data)
-    assert result.startswith("Invalid input format:")
+    # Test copy rule
+    ("valid_copy_rule", """1    p → q        Premise
+2    p → q        Copy, 1""",
+     "Valid Deduction"),
 
+    # Test a tab next to a field separator
+    ("valid_tab_next_to_separator", "1\t    p        Premise\n2    p    \tCopy, 1",
+     "Valid Deduction"),
 
-def test_empty_input():
-    """Test empty input"""
-    phase5 = Phase5()
-    input_data = ""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
-
-def test_valid_copy_rule():
-    """Test copy rule"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
-2    p → q        Copy, 1"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-
+    # Test copy rule with different formula
+    ("invalid_copy_different_formula", """1    p → q        Premise
+2    q → p        Copy, 1""",
+     "Invalid Deduction at Line 2"),
 
-def test_invalid_copy_different_formula():
-    """Test copy rule with different formula"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
-2    q → p        Copy, 1"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 2"
-
-def test_deeply_nested_scopes():
-    """Test deeply nested scopes"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test deeply nested scopes
+    ("deeply_nested_scopes", """1    p        Premise
       BeginScope
  2      q        Assumption
         BeginScope
@@ -306,59 +219,38 @@ def test_deeply_nested_scopes():
         EndScope
  7      r → (s → (p ∧ s))        →i, 3-6
       EndScope
- 8    q → (r → (s → (p ∧ s)))        →i, 2-7"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+ 8    q → (r → (s → (p ∧ s)))        →i, 2-7""",
+     "Valid Deduction"),
 
-def test_multiple_premises_complex_proof():
-    """Test complex proof with multiple premises"""
-    phase5 = Phase5()
-    input_data = """1    p → (q → r)        Premise
+    # Test complex proof with multiple premises
+    ("multiple_premises_complex_proof", """1    p → (q → r)        Premise
 2    p        Premise
 3    q        Premise
 4    q → r        →e, 1, 2
 5    r        →e, 4, 3
-6    q ∧ r        ∧i, 3, 5"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+6    q ∧ r        ∧i, 3, 5""",
+     "Valid Deduction"),
 
-def test_invalid_lem_wrong_format():
-    """Test LEM with wrong formula format (not A ∨ ¬A)"""
-    phase5 = Phase5()
-    input_data = """1    p ∨ q        LEM, 1"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 1"
+    # Test LEM with wrong formula format (not A ∨ ¬A)
+    ("invalid_lem_wrong_format", """1    p ∨ q        LEM, 1""",
+     "Invalid Deduction at Line 1"),
 
+    # Test LEM with incorrect negation placement
+    ("invalid_lem_incorrect_negation", """1    ¬p ∨ p        LEM, 1""",
+     "Invalid Deduction at Line 1"),
 
-def test_invalid_lem_incorrect_negation():
-    """Test LEM with incorrect negation placement"""
-    phase5 = Phase5()
-    input_data = """1    ¬p ∨ p        LEM, 1"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 1"
-
-def test_invalid_or_introduction_wrong_disjunct():
-    """Test or introduction with wrong second disjunct"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
-2    p ∨ r        ∨i1, 1, 1"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 2"
-
-
-def test_invalid_false_elim_not_contradiction():
-    """Test false elimination without actual contradiction"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
-2    q        ⊥e, 1"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 2"
+    # Test or introduction with wrong second disjunct
+    ("invalid_or_introduction_wrong_disjunct", """1    p        Premise
+2    p ∨ r        ∨i1, 1, 1""",
+     "Invalid Deduction at Line 2"),
 
+    # Test false elimination without actual contradiction
+    ("invalid_false_elim_not_contradiction", """1    p        Premise
+2    q        ⊥e, 1""",
+     "Invalid Deduction at Line 2"),
 
-def test_valid_chained_implications():
-    """Test complex chaining of implications"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
+    # Test complex chaining of implications
+    ("valid_chained_implications", """1    p → q        Premise
 2    q → r        Premise
 3    r → s        Premise
 4    p        Premise
@@ -370,23 +262,17 @@ def test_valid_chained_implications():
  9      ⊥        ¬e, 7, 8
       EndScope
 10    ¬(¬s)        ¬i, 8-9
-11    s        ¬¬e, 10"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
-def test_invalid_mt_wrong_formula_structure():
-    """Test modus tollens with wrong formula structure"""
-    phase5 = Phase5()
-    input_data = """1    p ∧ q        Premise
-2    ¬q        Premise
-3    ¬p        MT, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 3"
+11    s        ¬¬e, 10""",
+     "Valid Deduction"),
 
+    # Test modus tollens with wrong formula structure
+    ("invalid_mt_wrong_formula_structure", """1    p ∧ q        Premise
+2    ¬q        Premise
+3    ¬p        MT, 1, 2""",
+     "Invalid Deduction at Line 3"),
 
-def test_valid_mixed_connectives_complex():
-    """Test complex proof with mixed logical connectives"""
-    phase5 = Phase5()
-    input_data = """1    (p ∧ q) → (r ∨ s)        Premise
+    # Test complex proof with mixed logical connectives
+    ("valid_mixed_connectives_complex", """1    (p ∧ q) → (r ∨ s)        Premise
 2    ¬r ∧ ¬s        Premise
 3    p        Premise
 4    q        Premise
@@ -402,32 +288,21 @@ def test_valid_mixed_connectives_complex():
 11      s        Assumption
 12      ⊥        ¬e, 11, 6
       EndScope
-13    ⊥        ∨e, 8, 9-10, 11-12"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+13    ⊥        ∨e, 8, 9-10, 11-12""",
+     "Valid Deduction"),
 
-def test_invalid_assumption_outside_scope():
-    """Test assumption appearing outside of scope"""
-    phase5 = Phase5()
-    input_data = """1    p        Premise
+    # Test assumption appearing outside of scope
+    ("invalid_assumption_outside_scope", """1    p        Premise
 2    q        Assumption
-3    p ∧ q        ∧i, 1, 2"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"  # This might actually be valid in some systems
+3    p ∧ q        ∧i, 1, 2""",
+     "Valid Deduction"),  # This might actually be valid in some systems
 
+    # Test circular reference in rule application
+    ("invalid_circular_reference", """1    p        Copy, 1""",
+     "Invalid Deduction at Line 1"),
 
-def test_invalid_circular_reference():
-    """Test circular reference in rule application"""
-    phase5 = Phase5()
-    input_data = """1    p        Copy, 1"""
-    result = phase5.process(input_data)
-    assert result == "Invalid Deduction at Line 1"
-
-
-def test_valid_complex_biconditional_simulation():
-    """Test simulation of biconditional using implications"""
-    phase5 = Phase5()
-    input_data = """1    p → q        Premise
+    # Test simulation of biconditional using implications
+    ("valid_complex_biconditional_simulation", """1    p → q        Premise
 2    q → p        Premise
       BeginScope
  3      p        Assumption
@@ -443,14 +318,10 @@ def test_valid_complex_biconditional_simulation():
  9      ¬q        ¬i, 6-8
       EndScope
 10    p → q        →i, 3-4
-11    ¬p → ¬q        →i, 5-9"""
-    result = phase5.process(input_data)
-    assert result == "Valid Deduction"
+11    ¬p → ¬q        →i, 5-9""",
+     "Valid Deduction"),
 
-##
-def test_valid_deduction_pbc_law_of_excluded_middle(phase5):
-    expr = """\
-      BeginScope
+    ("valid_deduction_pbc_law_of_excluded_middle", """      BeginScope
  1      ¬(p ∨ (¬p))        Assumption
         BeginScope
  2        p        Assumption
@@ -461,24 +332,18 @@ def test_valid_deduction_pbc_law_of_excluded_middle(phase5):
  6      p ∨ (¬p)        ∨i2, 5
  7      ⊥        ¬e, 6, 1
       EndScope
- 8    p ∨ (¬p)        PBC, 1-7"""
-    expected_output = "Valid Deduction"
-    assert phase5.process(expr) == expected_output
+ 8    p ∨ (¬p)        PBC, 1-7""",
+     "Valid Deduction"),
 
-def test_invalid_deduction_due_to_wrong_mt(phase5):
-    expr = """\
- 1    p ∧ s        Premise
+    ("invalid_deduction_due_to_wrong_mt", """ 1    p ∧ s        Premise
  2    (¬q) → (¬(p ∧ s))        Premise
  3    (¬r) → (¬q)        Premise
  4    ¬(¬(p ∧ s))        ¬¬i, 1
  5    ¬(¬q)        MT, 2, 4
- 6    r        MT, 3, 5"""
-    expected_output = "Invalid Deduction at Line 6"
-    assert phase5.process(expr) == expected_output
+ 6    r        MT, 3, 5""",
+     "Invalid Deduction at Line 6"),
 
-def test_invalid_deduction_wrong_disjunction_elim(phase5):
-    expr = """\
- 1    (q ∨ t) → s        Premise
+    ("invalid_deduction_wrong_disjunction_elim", """ 1    (q ∨ t) → s        Premise
  2    (r ∧ q) → s        Premise
  3    q ∨ r        Premise
       BeginScope
@@ -491,13 +356,10 @@ def test_invalid_deduction_wrong_disjunction_elim(phase5):
  8      q ∨ t        ∨i1, 4
  9      s        →e, 8, 1
       EndScope
-10    s        ∨e, 3, 4-9, 5-7"""
-    expected_output = "Invalid Deduction at Line 10"
-    assert phase5.process(expr) == expected_output
+10    s        ∨e, 3, 4-9, 5-7""",
+     "Invalid Deduction at Line 10"),
 
-def test_invalid_deduction_disjunction_intro_fail(phase5):
-    expr = """\
- 1    p → q        Premise
+    ("invalid_deduction_disjunction_intro_fail", """ 1    p → q        Premise
  2    (¬p) ∨ p        LEM
       BeginScope
  3      ¬p        Assumption
@@ -508,6 +370,55 @@ def test_invalid_deduction_disjunction_intro_fail(phase5):
  6      q        →e, 5, 1
  7      (¬p) ∨ q        ∨i2, 6
       EndScope
- 8    (¬p) ∨ q        ∨e, 2, 3-7, 5-7"""
-    expected_output = "Invalid Deduction at Line 8"
-    assert phase5.process(expr) == expected_output
+ 8    (¬p) ∨ q        ∨e, 2, 3-7, 5-7""",
+     "Invalid Deduction at Line 8"),
+]
+
+
+@pytest.mark.parametrize("input_data, expected", [(text, expected) for _, text, expected in CASES],
+                         ids=[case_id for case_id, _, _ in CASES])
+def test_phase5(phase5, input_data, expected):
+    assert phase5.process(input_data) == expected
+
+
+def test_invalid_malformed_input(phase5):
+    """Test malformed input handling"""
+    input_data = "invalid line format"
+    result = phase5.process(input_data)
+    assert result.startswith("Invalid input format:")
+
+
+def test_invalid_signed_range_reference(phase5):
+    """Test that a range reference with a signed half is rejected"""
+    input_data = "1    p    Assumption\n2    p → p    →i, 1--1"
+    result = phase5.process(input_data)
+    assert result.startswith("Invalid input format:")
+
+
+def test_commutative_key_ignores_operand_order_of_and_or(phase1):
+    assert commutative_key(phase1.parse_tree("(p ∨ q) ∧ r")) == commutative_key(phase1.parse_tree("r ∧ (q ∨ p)"))
+    assert commutative_key(phase1.parse_tree("p → q")) != commutative_key(phase1.parse_tree("q → p"))
+    assert commutative_key(phase1.parse_tree("p ∧ q")) != commutative_key(phase1.parse_tree("p ∨ q"))
+
+
+def test_process_respects_subclass_overrides(phase5):
+    class StrictPhase5(Phase5):
+        def validate(self, proof):
+            return "Rejected"
+
+    text = CASES[0][1]
+    assert phase5.process(text) == "Valid Deduction"
+    assert StrictPhase5().process(text) == "Rejected"
+
+
+def test_validate_reuses_parsed_proofs(phase5):
+    for _, text, expected in CASES:
+        proof = phase5.parse(text)
+        assert phase5.parse(text) is proof
+        assert phase5.validate(proof) == expected
+        assert phase5.validate(proof) == expected
+
+
+def test_validate_resolves_plain_parser_output(phase5):
+    for _, text, expected in CASES:
+        assert phase5.validate(NaturalDeductionParser().parse(text)) == expected